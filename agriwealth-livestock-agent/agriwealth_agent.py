@@ -1,17 +1,21 @@
+import functools
 import logging
 import os
+import re
 import datetime
-from typing import Any, Dict, List, Optional, Callable
-from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.orm import sessionmaker
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import create_engine, event, text, inspect
+from sqlalchemy.sql.expression import TextClause
 from langgraph.graph import StateGraph, END
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-import time
-import math
-from state import AgentState, ConvertToSQL, RewrittenQuestion # Import state models
-from dotenv import load_dotenv e
+from state import AgentState, ConvertAndSynthesize, RewrittenQuestion # Import state models
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
 
 load_dotenv()
@@ -26,24 +30,58 @@ logger = logging.getLogger("agriwealth_agent")
 # DATABASE CONFIGURATION
 # =============================================================
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///agriwealth_livestock.db")
-engine = create_engine(DATABASE_URL, future=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+# SQLite connections are handed to worker threads in execute_multi_sql
+_CONNECT_ARGS = {"check_same_thread": False} if IS_SQLITE else {}
+engine = create_engine(DATABASE_URL, future=True, connect_args=_CONNECT_ARGS, pool_pre_ping=True)
+
+# The agent only ever reads, so queries skip transaction bookkeeping entirely
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+# Per-connection read tuning only. The journal mode is persistent in the database file,
+# so it is left to generate_data.py (which creates the database in WAL mode); setting it
+# here would rewrite the file header of whatever database the agent first connects to.
+SQLITE_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+]
+
+if IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Applies the SQLITE_PRAGMAS to every new DBAPI connection."""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
 
 # =============================================================
 # LLM FACTORY
 # =============================================================
-def get_llm(temp: float = 0) -> ChatGoogleGenerativeAI:
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
-    api_key = os.getenv("GEMINI_API_KEY", "")
-    return ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=temp, api_key=api_key)
+@functools.lru_cache(maxsize=8)
+def get_llm(temp: float = 0) -> "ChatGoogleGenerativeAI":
+    """Returns the Gemini client for a temperature; clients are reused across agent calls."""
+    # Deferred: langchain_google_genai pulls in grpc, google-auth and protobuf
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=temp, api_key=GEMINI_API_KEY)
 
 # =============================================================
 # DATABASE SCHEMA INSPECTION (UPDATED FOR DETERMINISTIC SAMPLES)
 # =============================================================
-_SCHEMA_CACHE: Optional[str] = None
-_CACHE_TIMESTAMP = 0
-SCHEMA_CACHE_DURATION = 300  # 5 minutes
 SPECIES = ['cow', 'goat', 'sheep', 'chicken']
+# Table name -> description for the 12 segregated tables, in schema order
+_EXPECTED_TABLES: Dict[str, str] = {}
+for s in SPECIES:
+    _EXPECTED_TABLES[f"{s}s"] = f"Core inventory for {s.upper()}s. PK: animal_id TEXT. Contains birth_date, status, weight_kg."
+    _EXPECTED_TABLES[f"{s}_health_records"] = f"Health records for {s.upper()}s. FK: animal_id TEXT. Contains record_type, cost."
+    _EXPECTED_TABLES[f"{s}_production_records"] = f"Production records for {s.upper()}s. FK: animal_id TEXT. Contains metric_type (Milk, Egg, Wool, Weight)."
+
+# Columns flagged (CRITICAL) in the schema text handed to the planner
+_CRITICAL_COLS = frozenset({'animal_id', 'birth_date', 'status', 'record_date', 'metric_type', 'value'})
 
 # --- DETERMINISTIC SAMPLE DATA FOR LLM CONTEXT ---
 SAMPLE_DATA = {
@@ -127,78 +165,94 @@ SAMPLE_DATA = {
 }
 # -----------------------------------------------
 
-def get_database_schema() -> str:
-    """Return a textual description of the segregated livestock database schema."""
-    global _SCHEMA_CACHE, _CACHE_TIMESTAMP
-    current_time = time.time()
-    
-    SCHEMA_CACHE_DURATION = 300
-    if _SCHEMA_CACHE is not None and (current_time - _CACHE_TIMESTAMP) < SCHEMA_CACHE_DURATION:
-        logger.debug("Using cached database schema.")
-        return _SCHEMA_CACHE
-
-    parts: List[str] = []
-    date_context = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    parts.append(f"**CURRENT REAL-WORLD DATE AND TIME: {date_context}**\n")
-    
-    inspector = inspect(engine)
-    
-    expected_tables: Dict[str, str] = {}
-    for s in SPECIES:
-        core = f"{s}s"
-        health = f"{s}_health_records"
-        production = f"{s}_production_records"
-        
-        expected_tables[core] = f"Core inventory for {s.upper()}s. PK: animal_id TEXT. Contains birth_date, status, weight_kg."
-        expected_tables[health] = f"Health records for {s.upper()}s. FK: animal_id TEXT. Contains record_type, cost."
-        expected_tables[production] = f"Production records for {s.upper()}s. FK: animal_id TEXT. Contains metric_type (Milk, Egg, Wool, Weight)."
-        
-    table_names = set(inspector.get_table_names())
-    
+def _gen_schema(expected_tables: Dict[str, str], table_names: Set[str], inspector: Any) -> Iterator[str]:
+    """Yields the schema text fragments in order (architecture, columns, sample data)."""
     # --- Architecture Context (CRITICAL for LLM) ---
-    parts.append("\n" + "="*60 + "\n")
-    parts.append("## DATABASE ARCHITECTURE: FULLY SEGREGATED BY SPECIES\n")
-    parts.append("Queries MUST JOIN tables with matching species prefixes.\n")
-    parts.append("ALL animal_id columns are **TEXT (e.g., COW.1, GOAT.20, SHEEP.1)**\n")
-    parts.append("### JOINING RULE:\n- Use SPECIES.animal_id = SPECIES_health_records.animal_id\n" + "="*60 + "\n")
+    yield "\n" + "="*60 + "\n"
+    yield "## DATABASE ARCHITECTURE: FULLY SEGREGATED BY SPECIES\n"
+    yield "Queries MUST JOIN tables with matching species prefixes.\n"
+    yield "ALL animal_id columns are **TEXT (e.g., COW.1, GOAT.20, SHEEP.1)**\n"
+    yield "### JOINING RULE:\n- Use SPECIES.animal_id = SPECIES_health_records.animal_id\n" + "="*60 + "\n"
     
     for table_name, description in expected_tables.items():
-        parts.append(f"## Table: **{table_name}**\n")
-        parts.append(f"*{description}*\n\n")
+        yield f"## Table: **{table_name}**\n"
+        yield f"*{description}*\n\n"
         
         if table_name not in table_names:
-            parts.append("*(Table not present in database)*\n\n")
+            yield "*(Table not present in database)*\n\n"
             continue
             
-        parts.append("### Columns:\n")
+        yield "### Columns:\n"
         try:
             columns = inspector.get_columns(table_name)
             for col in columns:
                 col_name = col['name']
                 col_type = str(col['type']).split('(')[0]
-                if col_name in ['animal_id', 'birth_date', 'status', 'record_date', 'metric_type', 'value']:
-                    parts.append(f"- **{col_name}**: {col_type} (CRITICAL)\n")
+                if col_name in _CRITICAL_COLS:
+                    yield f"- **{col_name}**: {col_type} (CRITICAL)\n"
                 else:
-                    parts.append(f"- {col_name}: {col_type}\n")
+                    yield f"- {col_name}: {col_type}\n"
         except Exception as e:
             logger.error(f"Could not inspect columns for {table_name}: {e}")
-            parts.append("*(Could not retrieve column information)*\n")
+            yield "*(Could not retrieve column information)*\n"
         
-        parts.append("\n### Sample Data (Deterministic):\n")
+        yield "\n### Sample Data (Deterministic):\n"
         if table_name in SAMPLE_DATA:
-            parts.append(SAMPLE_DATA[table_name])
+            yield SAMPLE_DATA[table_name]
         else:
-             parts.append("*(No hardcoded sample data available)*\n")
+            yield "*(No hardcoded sample data available)*\n"
         
-        parts.append("\n")
+        yield "\n"
 
-    schema_text = "".join(parts)
-    
-    _SCHEMA_CACHE = schema_text
-    _CACHE_TIMESTAMP = current_time
-    logger.info("Database schema cache refreshed for 12 segregated tables.")
+def _build_static_schema_body() -> str:
+    """Builds the immutable part of the schema text (architecture, columns, sample data)."""
+    inspector = inspect(engine)
+    table_names = set(inspector.get_table_names())
     
-    return schema_text
+    schema_body = "".join(_gen_schema(_EXPECTED_TABLES, table_names, inspector))
+    logger.info("Database schema body built for 12 segregated tables.")
+    return schema_body
+
+def _ensure_indexes() -> None:
+    """
+    Fallback for databases built before generate_data.py created the animal_id and
+    record_date indexes. Only missing indexes are created, so an indexed database is
+    never written to; record tables that do not exist are skipped. Never raises.
+    """
+    try:
+        inspector = inspect(engine)
+        table_names = set(inspector.get_table_names())
+        missing = []
+        for s in SPECIES:
+            for table, short in ((f"{s}_health_records", "health"), (f"{s}_production_records", "prod")):
+                if table not in table_names:
+                    continue
+                existing = {index["name"] for index in inspector.get_indexes(table)}
+                for name, col in ((f"idx_{s}_{short}_animal", "animal_id"), (f"idx_{s}_{short}_date", "record_date")):
+                    if name not in existing:
+                        missing.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({col})")
+        if not missing:
+            return
+        with engine.begin() as conn:
+            for statement in missing:
+                conn.execute(text(statement))
+        logger.info("Created %d missing record indexes.", len(missing))
+    except Exception as e:
+        logger.error(f"Could not create record indexes: {e}")
+
+_ensure_indexes()
+
+# The table layout and sample data never change during the process lifetime,
+# so the schema body is inspected once at import; only the date line is volatile.
+_STATIC_SCHEMA_BODY = _build_static_schema_body()
+
+def get_current_date_line() -> str:
+    """Return the volatile first line of the schema: the current real-world date and time."""
+    return f"**CURRENT REAL-WORLD DATE AND TIME: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}**"
+
+def get_database_schema() -> str:
+    """Return a textual description of the segregated livestock database schema."""
+    return get_current_date_line() + "\n" + _STATIC_SCHEMA_BODY
 
 def get_database_schema_cached() -> str:
     """Entry point for agents to retrieve the schema."""
@@ -212,33 +266,33 @@ FORBIDDEN_SQL_PATTERNS = [
     "delete from", "update ", "insert into", "create table", 
     "grant ", "revoke " 
 ]
-ALLOWED_TABLES = set()
-for s in SPECIES:
-    ALLOWED_TABLES.add(f"{s}s")
-    ALLOWED_TABLES.add(f"{s}_health_records")
-    ALLOWED_TABLES.add(f"{s}_production_records")
+ALLOWED_TABLES = set(_EXPECTED_TABLES)
+
+# Single-pass matchers for the safety checks (case-insensitive, no lowercase copy)
+_FORBIDDEN_RE = re.compile("|".join(re.escape(p) for p in FORBIDDEN_SQL_PATTERNS), re.IGNORECASE)
+_ALLOWED_RE = re.compile(r"\b(" + "|".join(re.escape(t) for t in ALLOWED_TABLES) + r")\b", re.IGNORECASE)
 
 def is_sql_safe(query: str) -> bool:
     """Enhanced safety checks. Only SELECT queries are permitted."""
     if not query or not query.strip():
         return False
         
-    q = query.strip().lower()
+    q = query.strip()
     
-    if not q.startswith("select"):
+    if q[:6].lower() != "select":
         logger.warning("SQL rejected: Must start with SELECT.")
         return False
 
-    if ";" in q and q.count(";") > 1:
+    if q.count(";") > 1:
         logger.warning("SQL rejected: multiple semicolons.")
         return False
         
-    for pat in FORBIDDEN_SQL_PATTERNS:
-        if pat in q:
-            logger.warning("SQL rejected due to forbidden pattern: %s", pat)
-            return False
+    forbidden = _FORBIDDEN_RE.search(q)
+    if forbidden:
+        logger.warning("SQL rejected due to forbidden pattern: %s", forbidden.group(0).lower())
+        return False
             
-    if not any(table in q for table in ALLOWED_TABLES):
+    if not _ALLOWED_RE.search(q):
         logger.warning("SQL rejected: no allowed segregated livestock tables referenced.")
         return False
             
@@ -259,20 +313,98 @@ def _get_chat_prompt_and_llm(prompt_messages: List[Any], structured_model: Optio
         
     return prompt, structured
 
+# Largest result set the planner's draft answer may be filled with before falling back to the synthesis LLM
+DRAFT_ANSWER_MAX_ROWS = 20
+
+def _md_cell(value: Any) -> str:
+    """Formats one value as a Markdown table cell: pipes escaped, line breaks flattened."""
+    return " ".join(str(value).splitlines()).replace("|", "\\|")
+
+def _rows_to_markdown(rows: List[Dict[str, Any]]) -> str:
+    """Renders a list of result rows as a Markdown table."""
+    if not rows:
+        return "*(No records found)*"
+    columns = list(rows[0].keys())
+    lines = [
+        "| " + " | ".join(_md_cell(c) for c in columns) + " |",
+        "| " + " | ".join(":---" for _ in columns) + " |",
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(_md_cell(row.get(c, "")) for c in columns) + " |")
+    return "\n".join(lines)
+
+# Only literal {query_N} tokens are substituted; the draft is model output, so no str.format field syntax
+_PLACEHOLDER_RE = re.compile(r"\{query_(\d+)\}")
+
+def _fill_answer_template(template: str, query_rows: Dict[str, Any]) -> Optional[str]:
+    """Substitutes each {query_N} placeholder with the rows of Query_N. Returns None if the template does not fit."""
+    referenced = set(_PLACEHOLDER_RE.findall(template))
+    if not referenced:
+        # A draft that never references the results was not grounded in the data
+        return None
+    tables: Dict[str, str] = {}
+    for key, rows in query_rows.items():
+        if key.endswith("_Success") and rows:
+            tables[key.split('_')[1]] = _rows_to_markdown(rows)
+    if not referenced <= tables.keys():
+        logger.warning("Planner draft answer references queries without rows; using synthesis LLM.")
+        return None
+    return _PLACEHOLDER_RE.sub(lambda m: tables[m.group(1)], template)
+
+# Small results made only of raw table columns, for questions the planner flagged as plain
+# listings ("list active cows"), are rendered directly; everything else still goes to the LLM.
+LISTING_MAX_ROWS = 10
+_RAW_COLUMNS = frozenset({
+    'animal_id', 'name', 'breed', 'tag_id', 'birth_date', 'acquisition_date', 'status', 'sex',
+    'weight_kg', 'last_fed_time', 'record_id', 'record_date', 'record_type', 'description',
+    'cost', 'administered_by', 'production_id', 'metric_type', 'value', 'notes'
+})
+_LISTING_ANSWER_TEMPLATE = """## Results for {animal_type}
+
+{tables}
+"""
+
+_FROM_TABLE_RE = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+
+def _listing_tables(query_rows: Dict[str, Any], sql_queries: List[str]) -> str:
+    """Renders each query's rows as a Markdown table under a heading naming the query and its table."""
+    sections = []
+    for key, rows in query_rows.items():
+        n = int(key.split('_')[1])
+        heading = f"### Query {n}"
+        if n <= len(sql_queries):
+            m = _FROM_TABLE_RE.search(sql_queries[n - 1])
+            if m:
+                heading += f": {m.group(1)}"
+        sections.append(f"{heading}\n\n{_rows_to_markdown(rows)}")
+    return "\n\n".join(sections)
+
+def _is_listing_shape(query_rows: Dict[str, Any]) -> bool:
+    """True when every query succeeded with at most LISTING_MAX_ROWS rows of raw table columns."""
+    if not all(key.endswith("_Success") for key in query_rows):
+        return False
+    if sum(len(rows) for rows in query_rows.values()) > LISTING_MAX_ROWS:
+        return False
+    return all(row.keys() <= _RAW_COLUMNS for rows in query_rows.values() for row in rows)
+
+# One pass over the question collects every entity word; ties resolve by _ENTITY_PRIORITY
+_ENTITY_RE = re.compile(
+    r"\b(?:"
+    r"(?P<cow>cows?|bulls?|calf|calves)"
+    r"|(?P<goat>goats?|kids?|nanny|nannies)"
+    r"|(?P<sheep>sheep|lambs?|ewes?)"
+    r"|(?P<chicken>chickens?|fowls?|poultry|hens?|roosters?)"
+    r"|(?P<general>animals?|livestock|stock|inventory)"
+    r")\b",
+    re.IGNORECASE
+)
+
+_ENTITY_PRIORITY = ("cow", "goat", "sheep", "chicken", "general")
+
 def detect_entity(question: str) -> str:
     """Heuristically detects the primary species entity in the question."""
-    q = (question or "").lower()
-    if any(word in q for word in ["cow", "bull", "calf"]):
-        return "cow"
-    if any(word in q for word in ["goat", "kid", "nanny"]):
-        return "goat"
-    if any(word in q for word in ["sheep", "lamb", "ewe"]):
-        return "sheep"
-    if any(word in q for word in ["chicken", "fowl", "poultry", "hen", "rooster"]):
-        return "chicken"
-    if any(word in q for word in ["animal", "livestock", "stock", "inventory"]):
-        return "general"
-    return "general"
+    found = {m.lastgroup for m in _ENTITY_RE.finditer(question or "")}
+    return next((entity for entity in _ENTITY_PRIORITY if entity in found), "general")
     
 def router_entry_func(state: AgentState) -> AgentState:
     """A simple pass-through function used as the initial node to ensure a dict is returned."""
@@ -305,6 +437,11 @@ def db_entry_agent(state: AgentState) -> AgentState:
     return state
 
 # --- WEB RESEARCH AGENT ---
+_TOOL_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are AgriWealth AI, a livestock expert. Use the 'google_search' tool to find current, practical advice. Focus on: Prevention, symptoms, treatment, and best practices for {animal_type}. Provide: Clear, actionable advice suitable for smallholder farmers. """),
+    ("human", "Farmer's question: {question}")
+])
+
 def web_research_agent(state: AgentState) -> AgentState:
     """
     Uses the Google Search tool (placeholder) to find general livestock advice.
@@ -312,14 +449,9 @@ def web_research_agent(state: AgentState) -> AgentState:
     state.setdefault("animal_type", "unknown")
     state.setdefault("question", "")
     
-    TOOL_SYSTEM_PROMPT = ChatPromptTemplate.from_messages([
-        ("system", """You are AgriWealth AI, a livestock expert. Use the 'google_search' tool to find current, practical advice. Focus on: Prevention, symptoms, treatment, and best practices for {animal_type}. Provide: Clear, actionable advice suitable for smallholder farmers. """),
-        ("human", "Farmer's question: {question}")
-    ])
-    
     llm_with_tool = get_llm(0.1)
     
-    research_chain = TOOL_SYSTEM_PROMPT | llm_with_tool | StrOutputParser()
+    research_chain = _TOOL_PROMPT | llm_with_tool | StrOutputParser()
 
     logger.info("Invoking Web Research Agent (LIVE SEARCH PLACEHOLDER).")
     
@@ -333,6 +465,11 @@ def web_research_agent(state: AgentState) -> AgentState:
     return state
 
 # --- DISEASE DIAGNOSIS AGENT ---
+_DIAGNOSIS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are AgriHealth AI, a visual livestock disease expert. Analyze the image and question about {animal_type}. Process: 1. Describe visible symptoms. 2. Use 'google_search' for matching diseases. 3. Provide likely diagnosis and immediate actions. 4. ALWAYS recommend consulting a local veterinarian. """),
+    ("human", "Visual diagnosis request: {question}")
+])
+
 def disease_diagnosis_agent(state: AgentState) -> AgentState:
     """
     Uses the Google Search tool (placeholder) for visual diagnosis and immediate actions.
@@ -341,13 +478,8 @@ def disease_diagnosis_agent(state: AgentState) -> AgentState:
     state.setdefault("question", "")
     
     # Mode 2 includes the specific image request for visual aid
-    DIAGNOSIS_SYSTEM_PROMPT = ChatPromptTemplate.from_messages([
-        ("system", """You are AgriHealth AI, a visual livestock disease expert. Analyze the image and question about {animal_type}. Process: 1. Describe visible symptoms. 2. Use 'google_search' for matching diseases. 3. Provide likely diagnosis and immediate actions. 4. ALWAYS recommend consulting a local veterinarian. """),
-        ("human", "Visual diagnosis request: {question}")
-    ])
-    
     llm_with_tool = get_llm(0.1)
-    diagnosis_chain = DIAGNOSIS_SYSTEM_PROMPT | llm_with_tool | StrOutputParser()
+    diagnosis_chain = _DIAGNOSIS_PROMPT | llm_with_tool | StrOutputParser()
 
     logger.info("Invoking Disease Diagnosis Agent (LIVE SEARCH PLACEHOLDER).")
     
@@ -361,16 +493,8 @@ def disease_diagnosis_agent(state: AgentState) -> AgentState:
     return state
 
 # --- SQL GENERATOR AGENT (PLANNER) ---
-def convert_nl_to_sql(state: AgentState) -> AgentState:
-    """
-    Converts the natural language question into 1-5 optimized SQL SELECT queries.
-    """
-
-    state.setdefault("db_entry", "")
-    state.setdefault("animal_type", "unknown")
-
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """
+_PLANNER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """
 You are an **Expert SQL Data Analyst and Query Planner**.
 
 Your ONLY task is to convert the user's database question into **1 to 5 optimized SQL SELECT queries** required to fully answer the question.
@@ -407,6 +531,22 @@ Your ONLY task is to convert the user's database question into **1 to 5 optimize
 6. ✅ SORTING:
    - Do NOT use ORDER BY in the query. All sorting must be done by the synthesis agent.
 
+7. ✅ ROW LIMIT
+   - ALWAYS include `LIMIT N` (N ≤ 100) in every SELECT.
+
+8. ✅ DRAFT ANSWER TEMPLATE
+   - For SIMPLE lookups (e.g. "list active cows", "show vaccinations for COW.1"),
+     also write a short Markdown draft answer.
+   - Use {{query_1}} ... {{query_5}} where the rows of each query should appear.
+   - Leave it EMPTY if the answer needs calculations, comparisons, age/life-stage
+     reasoning or advice.
+
+9. ✅ SIMPLE LISTING FLAG
+   - Set is_simple_listing to true ONLY if the raw rows alone fully answer the
+     question (e.g. "list active cows").
+   - Set it to false if the answer needs calculations, comparisons, age/life-stage
+     reasoning or advice.
+
 =========================
 📦 DATABASE SCHEMA & CURRENT DATE
 =========================
@@ -416,83 +556,205 @@ Your ONLY task is to convert the user's database question into **1 to 5 optimize
 🐾 QUESTION ABOUT {animal_type}
 =========================
 """),
-        ("human", "{db_entry}")
-    ])
-
-    llm = get_llm(0)
-    structured = llm.with_structured_output(ConvertToSQL)
-    chain = prompt | structured
+    ("human", "{db_entry}")
+])
+
+@functools.lru_cache(maxsize=None)
+def _planner_chain():
+    """Planner chain, built on first use so the structured-output JSON schema is reflected only once."""
+    return _PLANNER_PROMPT | get_llm(0).with_structured_output(ConvertAndSynthesize)
+
+# Planner output per (animal_type, question, day); the day is part of the key because the SQL
+# may embed the current date. execute_multi_sql evicts plans whose SQL fails.
+PLAN_CACHE_MAX = 512
+_PLAN_CACHE: Dict[Tuple[str, str, str], Tuple[Tuple[str, ...], str, bool]] = {}
+
+def _plan_key(state: AgentState) -> Tuple[str, str, str]:
+    """Cache key for the planner output of the state's current question."""
+    # Only whitespace is normalized: animal IDs such as 'COW.1' are case-sensitive in SQL
+    question = re.sub(r"\s+", " ", state.get("db_entry", "").strip())
+    return state.get("animal_type", "unknown"), question, datetime.date.today().isoformat()
+
+def _plan_sql(key: Tuple[str, str, str]) -> Tuple[Tuple[str, ...], str, bool]:
+    """Runs the planner LLM for one question shape, reusing a cached plan when there is one."""
+    plan = _PLAN_CACHE.get(key)
+    if plan is not None:
+        return plan
 
     logger.info("Invoking Multi-Query SQL Planner Agent using db_entry.")
 
-    result = chain.invoke({
+    animal_type, db_entry, _ = key
+    result = _planner_chain().invoke({
         "schema": get_database_schema_cached(),
-        "animal_type": state["animal_type"],
-        "db_entry": state["db_entry"]
+        "animal_type": animal_type,
+        "db_entry": db_entry
     })
 
-    state["sql_query"] = result.sql_queries
+    plan = (tuple(result.sql_queries), result.draft_answer_template or "", bool(result.is_simple_listing))
+    if len(_PLAN_CACHE) >= PLAN_CACHE_MAX:
+        # Dicts keep insertion order, so this drops the oldest plan
+        _PLAN_CACHE.pop(next(iter(_PLAN_CACHE)), None)
+    _PLAN_CACHE[key] = plan
+    return plan
+
+def convert_nl_to_sql(state: AgentState) -> AgentState:
+    """
+    Converts the natural language question into 1-5 optimized SQL SELECT queries.
+    """
+
+    state.setdefault("db_entry", "")
+    state.setdefault("animal_type", "unknown")
+
+    sql_queries, answer_template, is_simple_listing = _plan_sql(_plan_key(state))
 
-    logger.info("Generated %d SQL queries.", len(state["sql_query"]))
+    state["sql_query"] = list(sql_queries)
+    state["answer_template"] = answer_template
+    state["is_simple_listing"] = is_simple_listing
+
+    logger.info(
+        "Generated %d SQL queries (draft answer: %s).",
+        len(state["sql_query"]), "yes" if state["answer_template"] else "no"
+    )
 
     return state
 
 # --- SQL EXECUTION LAYER ---
+MAX_SQL_WORKERS = 5  # Matches the planner's 5-query ceiling
+_HAS_LIMIT = re.compile(r"\blimit\s+\d+", re.IGNORECASE)
+# Bounds on the serialized results handed to the LLMs; query_rows keeps every row
+LLM_ROWS_PER_QUERY = 20
+LLM_RESULT_MAX_CHARS = 8000
+
+@functools.lru_cache(maxsize=256)
+def _sql_text(query: str) -> TextClause:
+    """Builds the TextClause once per unique SQL string, so SQLAlchemy parses it only once."""
+    return text(query)
+
+def _llm_result_view(results: Dict[str, Any]) -> str:
+    """
+    Serializes query results for the LLMs as compact JSON. Long results are cut at row
+    boundaries and say so ("truncated", "total_rows"), so the LLM knows it sees a subset.
+    """
+    rows_per_query = LLM_ROWS_PER_QUERY
+    while True:
+        view: Dict[str, Any] = {}
+        for key, value in results.items():
+            if not isinstance(value, list):
+                view[key] = value
+                continue
+            shown = value[:rows_per_query]
+            entry: Dict[str, Any] = {"total_rows": len(value), "rows": shown}
+            if len(shown) < len(value):
+                entry["truncated"] = f"showing {len(shown)} of {len(value)} rows"
+            view[key] = entry
+        encoded = orjson.dumps(view, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        # Shrink whole rows rather than slicing the string, so the JSON stays valid
+        if len(encoded) <= LLM_RESULT_MAX_CHARS or rows_per_query == 0:
+            return encoded
+        rows_per_query //= 2
+
+def _execute_one_sql(i: int, query: str) -> Tuple[str, Any]:
+    """
+    Runs a single, already validated SELECT on its own connection.
+    Returns the result key and either the rows or the error message.
+    """
+    try:
+        # The planner is told to always emit LIMIT; this is only a safety belt
+        query_to_execute = query
+        if not _HAS_LIMIT.search(query):
+            query_to_execute = f"{query} LIMIT 100"
+
+        with read_engine.connect() as conn:
+            result = conn.execute(_sql_text(query_to_execute))
+            rows = [dict(mapping) for mapping in result.mappings()]
+
+        logger.info(
+            f"SQL {i+1} executed successfully. Rows returned: {len(rows)}"
+        )
+        return f"Query_{i+1}_Success", rows
+
+    except Exception as e:
+        logger.exception(f"SQL {i+1} execution error.")
+        return f"Query_{i+1}_Error", f"Error executing: {str(e)}"
+
 def execute_multi_sql(state: AgentState) -> AgentState:
     """
     Safely executes the list of SQL SELECT queries generated by the SQL Planning Agent.
+    The queries are independent, so they run concurrently on separate connections.
     """
 
-    queries = state.get("sql_query", [])
-    session = SessionLocal()
+    queries = [query.strip() for query in state.get("sql_query", [])]
+    outcomes: List[Any] = []
     combined_results = {}
     error_count = 0
 
-    for i, query in enumerate(queries):
-        query = query.strip()
-        logger.debug(f"Attempting to execute SQL {i+1}: {query}")
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_SQL_WORKERS, len(queries)))) as pool:
+        for i, query in enumerate(queries):
+            logger.debug(f"Attempting to execute SQL {i+1}: {query}")
 
-        # Mandatory SQL safety check
-        if not is_sql_safe(query):
-            combined_results[f"Query_{i+1}_Refused"] = "Refused to execute unsafe SQL."
-            error_count += 1
-            logger.warning(f"SQL {i+1} blocked by safety policy.")
-            continue
+            # Mandatory SQL safety check
+            if not is_sql_safe(query):
+                outcomes.append((f"Query_{i+1}_Refused", "Refused to execute unsafe SQL."))
+                logger.warning(f"SQL {i+1} blocked by safety policy.")
+                continue
 
-        try:
-            # Enforce max row limit for safety
-            query_to_execute = query
-            if 'limit' not in query.lower():
-                query_to_execute = f"{query} LIMIT 100"
+            outcomes.append(pool.submit(_execute_one_sql, i, query))
 
-            result = session.execute(text(query_to_execute))
-            rows = result.fetchall()
-            keys = result.keys()
-
-            combined_results[f"Query_{i+1}_Success"] = [
-                dict(zip(keys, row)) for row in rows
-            ]
-
-            logger.info(
-                f"SQL {i+1} executed successfully. Rows returned: {len(rows)}"
-            )
-
-        except Exception as e:
-            session.rollback()
-            combined_results[f"Query_{i+1}_Error"] = f"Error executing: {str(e)}"
+    # Collect in submission order so the Query_N keys stay aligned with sql_query
+    for outcome in outcomes:
+        key, value = outcome if isinstance(outcome, tuple) else outcome.result()
+        combined_results[key] = value
+        if not key.endswith("_Success"):
             error_count += 1
-            logger.exception(f"SQL {i+1} execution error.")
-
-    session.close()
 
+    # Compact JSON is deterministic and far cheaper in tokens than the Python repr
     state["query_rows"] = combined_results
-    state["query_result"] = str(combined_results)
+    state["query_result"] = _llm_result_view(combined_results)
     state["sql_error"] = (error_count > 0)
 
+    if state["sql_error"]:
+        # Don't replay a failing plan the next time the same question is asked
+        _PLAN_CACHE.pop(_plan_key(state), None)
+
     return state
 
 
 # --- RESPONSE FORMATTING AGENT (SYNTHESIS) ---
+_SYNTHESIS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are the AgriWealth Livestock Synthesis AI. "
+     "You transform database results into accurate, life-stage-safe, farmer-friendly advice. "
+     "Strict age and life-stage enforcement is mandatory. "
+     "Format using Markdown."),
+    ("human", "{input}")
+])
+
+# Fixed replies for the common no-result cases; these never need the LLM
+_NO_DATA_TEMPLATE = """## No Records Found
+
+We couldn't find any matching {species}records for your question.
+
+This usually means some records have not been entered yet. Please check:
+- Birth records
+- Health records
+- Vaccination history
+- Weight or feeding data
+
+Keeping these records up to date helps AgriWealth give you better advice. 🌱
+"""
+
+_SQL_ERROR_TEMPLATE = """## Some Data Could Not Be Retrieved
+
+We couldn't fetch part of the {species}records needed for your question.
+
+- Your farm data is safe; nothing was changed.
+- Please try rephrasing or simplifying your question.
+"""
+
+def _species_label(animal_type: str) -> str:
+    """Bold species name plus a space for the fixed replies; empty for 'general'/'unknown' questions."""
+    return f"**{animal_type}** " if animal_type in SPECIES else ""
+
 def generate_human_readable_answer(state: AgentState) -> AgentState:
     """
     Converts raw SQL query results into a clear, simple, and highly actionable answer.
@@ -505,62 +767,58 @@ def generate_human_readable_answer(state: AgentState) -> AgentState:
     state.setdefault("sql_error", False)
     state.setdefault("animal_type", "unknown")
     state.setdefault("db_entry", "")
+    state.setdefault("answer_template", "")
+    state.setdefault("is_simple_listing", False)
 
     # =========================
     # 🚨 CASE 1: SQL ERROR
     # =========================
     if state["sql_error"]:
-        prompt_text = f"""
-Animal Type: {state['animal_type']}
-
-SQL Error Details:
-{state['query_result']}
-
-TASK:
-Create a polite, friendly message for the farmer explaining:
-- That part of the data could not be retrieved
-- That the system is safe
-- That they should rephrase or simplify their question
-- Keep the tone calm, helpful, and respectful
-"""
+        state["query_result"] = _SQL_ERROR_TEMPLATE.format(species=_species_label(state["animal_type"]))
+        logger.info("Returned templated SQL error message. Skipped synthesis LLM.")
+        return state
 
     # =========================
     # 🚨 CASE 2: NO DATA FOUND
     # =========================
-    elif not any(state["query_rows"].values()):
-        prompt_text = f"""
-Animal Type: {state['animal_type']}
-Original Question: {state['db_entry']}
-
-No records were found in the system.
-
-TASK:
-Politely advise the farmer on what may be missing, such as:
-- Birth records
-- Health records
-- Vaccination history
-- Weight or feeding data
-
-Encourage proper record keeping in a supportive way.
-"""
+    if not any(state["query_rows"].values()):
+        state["query_result"] = _NO_DATA_TEMPLATE.format(species=_species_label(state["animal_type"]))
+        logger.info("Returned templated no-data message. Skipped synthesis LLM.")
+        return state
 
     # =========================
     # ✅ CASE 3: DATA AVAILABLE → FULL SYNTHESIS
     # =========================
-    else:
-        current_date_info = next(
-            (line for line in get_database_schema_cached().split('\n')
-             if 'CURRENT REAL-WORLD DATE' in line),
-            'No current date provided.'
+    total_rows = sum(len(v) for v in state["query_rows"].values() if isinstance(v, list))
+
+    # Plain listings render straight into Markdown tables, but only when the planner classified
+    # the question as one; a small raw-column result can still need age or advice reasoning
+    if state["is_simple_listing"] and _is_listing_shape(state["query_rows"]):
+        state["query_result"] = _LISTING_ANSWER_TEMPLATE.format(
+            animal_type=state["animal_type"],
+            tables=_listing_tables(state["query_rows"], state["sql_query"])
         )
-        
-        prompt_text = f"""
+        logger.info("Rendered listing result (%d rows) directly. Skipped synthesis LLM.", total_rows)
+        return state
+
+    # Other simple lookups: the planner already drafted the answer in the same LLM call.
+    # A draft that does not fit the results falls through to the synthesis LLM.
+    if state["answer_template"] and total_rows <= DRAFT_ANSWER_MAX_ROWS:
+        draft = _fill_answer_template(state["answer_template"], state["query_rows"])
+        if draft is not None:
+            state["query_result"] = draft
+            logger.info("Used planner draft answer (%d rows). Skipped synthesis LLM.", total_rows)
+            return state
+
+    current_date_info = get_current_date_line()
+    
+    prompt_text = f"""
 Animal Type: {state['animal_type']}
 Original Question: {state['db_entry']}
 
 CONTEXT:
 - {current_date_info}
-- Raw Multi-Query Results:
+- Raw Multi-Query Results (a "truncated" query shows only its first rows; "total_rows" is the full count):
 {state['query_result']}
 
 =========================
@@ -591,6 +849,9 @@ CONTEXT:
      - Weight
      - Production
    - Present them as ONE clear conclusion.
+   - If a query is marked "truncated", do NOT claim a count, maximum, minimum or
+     "oldest/youngest" over all rows; use "total_rows" for counts and say the answer
+     is based on the rows shown.
 
 5. ✅ FARMER-FRIENDLY OUTPUT
    - Use:
@@ -614,16 +875,7 @@ Produce a single, clear, practical answer that a farmer in Africa can confidentl
     # =========================
     # 🧠 LLM INVOCATION
     # =========================
-    prompt = ChatPromptTemplate.from_messages([
-        ("system",
-         "You are the AgriWealth Livestock Synthesis AI. "
-         "You transform database results into accurate, life-stage-safe, farmer-friendly advice. "
-         "Strict age and life-stage enforcement is mandatory. "
-         "Format using Markdown."),
-        ("human", "{input}")
-    ])
-
-    chain = prompt | get_llm(0.3) | StrOutputParser()
+    chain = _SYNTHESIS_PROMPT | get_llm(0.3) | StrOutputParser()
 
     logger.info("Invoking livestock response synthesis LLM.")
 
@@ -637,18 +889,8 @@ Produce a single, clear, practical answer that a farmer in Africa can confidentl
 
 
 # --- QUERY RECOVERY AGENT ---
-def regenerate_query(state: AgentState) -> AgentState:
-    """
-    Rewrites the farmer’s original question when SQL planning or execution fails.
-    """
-
-    state.setdefault("db_entry", "")
-    state.setdefault("attempts", 0)
-    state.setdefault("animal_type", "unknown")
-    state.setdefault("query_result", "Unknown error")
-
-    rewrite_prompt = ChatPromptTemplate.from_messages([
-        ("system", """
+_REWRITE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """
 You are a QUERY REWRITING AI for a livestock database system.
 
 The previous SQL attempt FAILED with this error:
@@ -673,12 +915,25 @@ ABSOLUTE PROHIBITIONS:
 Return ONLY the rewritten question.
 """),
 
-        ("human", "Original question about {animal_type}: {question}")
-    ])
+    ("human", "Original question about {animal_type}: {question}")
+])
+
+@functools.lru_cache(maxsize=None)
+def _rewrite_chain():
+    """Query rewriter chain, built on first use so the structured-output JSON schema is reflected only once."""
+    return _REWRITE_PROMPT | get_llm(0).with_structured_output(RewrittenQuestion)
+
+def regenerate_query(state: AgentState) -> AgentState:
+    """
+    Rewrites the farmer’s original question when SQL planning or execution fails.
+    """
+
+    state.setdefault("db_entry", "")
+    state.setdefault("attempts", 0)
+    state.setdefault("animal_type", "unknown")
+    state.setdefault("query_result", "Unknown error")
 
-    llm = get_llm(0)
-    structured = llm.with_structured_output(RewrittenQuestion)
-    chain = rewrite_prompt | structured
+    chain = _rewrite_chain()
 
     logger.info("Invoking query rewriter LLM.")
 
@@ -1,8 +1,12 @@
 import sqlite3
 import random
+from collections import Counter
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+import numpy as np
 from faker import Faker
-from typing import Dict, List, Tuple
+from typing import List, Sequence, Tuple
 
 # --- CONFIGURATION ---
 DB_NAME = "agriwealth_livestock.db"
@@ -15,26 +19,92 @@ NUM_ANIMALS = NUM_COWS + NUM_GOATS + NUM_CHICKENS + NUM_SHEEP
 # Current date MUST match the current date logic in the agent for age calculation to work
 CURRENT_DATE = datetime(2025, 11, 26) 
 
+# ISO strings for every day back from CURRENT_DATE, so per-row dates are list lookups, not strftime
+MAX_DAY_OFFSET = 3650
+_DATE_CACHE = [(CURRENT_DATE - timedelta(days=d)).strftime('%Y-%m-%d') for d in range(MAX_DAY_OFFSET + 1)]
+# Same for every minute back in the last-fed window (up to 12h59m before CURRENT_DATE)
+_FED_TIME_CACHE = [(CURRENT_DATE - timedelta(minutes=m)).strftime('%Y-%m-%d %H:%M:%S') for m in range(13 * 60)]
+
 # Record targets
 NUM_HEALTH_RECORDS = NUM_ANIMALS * 3 
 NUM_PRODUCTION_RECORDS = NUM_ANIMALS * 4 
 
 fake = Faker('en_US')
 
-# Helper function to get the correct table name based on animal type and record category
-def get_table_name(animal_type: str, category: str) -> str:
-    """Returns the species-specific table name."""
-    prefix = animal_type.lower()
-    if category == 'health':
-        return f"{prefix}_health_records"
-    elif category == 'production':
-        return f"{prefix}_production_records"
-    return prefix 
+# Fixed health-record descriptions; record types without an entry get Faker text
+VACCINATION_DESCS = ('FMD vaccine administered', 'Blackquarter dose', 'Peste des Petits Ruminants (PPR) vaccine')
+TREATMENT_DESCS = ('Antibiotics for mastitis', 'Acaricide dip for ticks', 'Fluid therapy')
+SYMPTOM_DESCS = ('Sudden drop in feed intake', 'Lethargy and fever', 'Diarrhea')
+INJURY_DESCS = ('Deep laceration on leg', 'Broken horn', 'Eye infection')
+HEALTH_DESCRIPTIONS = {
+    'Vaccination': VACCINATION_DESCS,
+    'Treatment': TREATMENT_DESCS,
+    'Symptom': SYMPTOM_DESCS,
+    'Injury': INJURY_DESCS,
+}
+
+# Age groups (newborn, juvenile, mature, old): draw probabilities and birth-date offset ranges in days
+AGE_GROUP_PROBS = [0.05, 0.25, 0.60, 0.10]
+AGE_GROUP_DAY_RANGES = np.array([[1, 30], [31, 730], [731, 1825], [1826, 3650]])
+
+# Species -> (breeds, min weight kg, max weight kg)
+SPECIES_PROFILES = {
+    'cow': (['Dairy Cross', 'Boran', 'Friesian'], 250, 600),
+    'goat': (['Boer', 'Saanen', 'Local'], 30, 80),
+    'chicken': (['Broiler', 'Layer', 'Kienyeji'], 1.5, 3.5),
+    'sheep': (['Dorper', 'Red Maasai', 'Merino'], 40, 90),
+}
+SPECIES_ORDER = list(SPECIES_PROFILES)
+SPECIES_CODES = {s: code for code, s in enumerate(SPECIES_ORDER)}
+# Species -> species-specific record table name
+HEALTH_TABLE = {s: f"{s}_health_records" for s in SPECIES_ORDER}
+PROD_TABLE = {s: f"{s}_production_records" for s in SPECIES_ORDER}
+
+# Bulk-load settings: WAL journal, no fsync per statement, temp data and page cache in memory
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+]
+
+# Max bound parameters per statement when the connection can't report it (Python < 3.11);
+# 999 is SQLITE_MAX_VARIABLE_NUMBER in SQLite builds older than 3.32
+SQLITE_DEFAULT_MAX_VARIABLES = 999
+
+def get_max_variables(conn: sqlite3.Connection) -> int:
+    """Returns the bound-parameter limit of this connection's SQLite build."""
+    if hasattr(conn, "getlimit"):
+        return conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    return SQLITE_DEFAULT_MAX_VARIABLES
+
+@lru_cache(maxsize=None)
+def _multi_row_insert_sql(table: str, cols: Tuple[str, ...], n_rows: int) -> str:
+    """Builds an INSERT with n_rows VALUES groups (cached, so full-size chunks are built once)."""
+    row_placeholders = "(" + ", ".join(["?"] * len(cols)) + ")"
+    return f"INSERT INTO {table} ({', '.join(cols)}) VALUES " + ", ".join([row_placeholders] * n_rows)
+
+def bulk_insert(cursor: sqlite3.Cursor, table: str, cols: Tuple[str, ...], rows: Sequence[Tuple], max_variables: int) -> None:
+    """Inserts rows with multi-row VALUES statements, chunked to stay under max_variables bound parameters."""
+    max_rows = max_variables // len(cols)
+    for start in range(0, len(rows), max_rows):
+        chunk = rows[start:start + max_rows]
+        cursor.execute(_multi_row_insert_sql(table, cols, len(chunk)), list(chain.from_iterable(chunk)))
+
+def partition_by_species(record_species: np.ndarray) -> List[np.ndarray]:
+    """Splits record positions into one index array per species code (in SPECIES_ORDER), keeping record order."""
+    order = np.argsort(record_species, kind='stable')
+    bounds = np.cumsum(np.bincount(record_species, minlength=len(SPECIES_ORDER)))[:-1]
+    return np.split(order, bounds)
 
 def generate_db_data():
     """Generates the SQLite database with synthetic livestock data based on the fully segregated schema and TEXT IDs."""
-    conn = sqlite3.connect(DB_NAME)
+    # Autocommit mode: the transaction below is managed explicitly
+    conn = sqlite3.connect(DB_NAME, isolation_level=None)
     cursor = conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    max_variables = get_max_variables(conn)
 
     # --- 1. Drop Tables ---
     table_names_to_drop = [
@@ -43,57 +113,69 @@ def generate_db_data():
         "cow_production_records", "goat_production_records", "sheep_production_records", "chicken_production_records",
         "production_records", "health_records", "farm_transactions"
     ]
-    for table in table_names_to_drop:
-        cursor.execute(f"DROP TABLE IF EXISTS {table}")
-        
+
     # --- 2. Create All 12 Species-Specific Tables ---
+    species = ['cows', 'goats', 'sheeps', 'chickens']
+    
+    # --- NEW SPECIES-SPECIFIC CORE ANIMAL TABLES ---
+    common_animal_columns = """
+        animal_id TEXT PRIMARY KEY, 
+        name TEXT NOT NULL,
+        breed TEXT,
+        tag_id TEXT UNIQUE,
+        birth_date DATE,
+        acquisition_date DATE,
+        status TEXT NOT NULL CHECK(status IN ('Active', 'Sold', 'Deceased', 'Quarantined')),
+        sex TEXT CHECK(sex IN ('Male', 'Female', 'Unknown')),
+        weight_kg REAL,
+        last_fed_time DATETIME
+    """
+
+    # --- NEW SPECIES-SPECIFIC HEALTH TABLES ---
+    common_health_columns = """
+        record_id INTEGER PRIMARY KEY,
+        animal_id TEXT NOT NULL, 
+        record_date DATE NOT NULL,
+        record_type TEXT NOT NULL CHECK(record_type IN ('Vaccination', 'Treatment', 'Deworming', 'Injury', 'Symptom')),
+        description TEXT,
+        cost REAL,
+        administered_by TEXT
+    """
+
+    # --- NEW SPECIES-SPECIFIC PRODUCTION TABLES ---
+    # animal_id is now TEXT NOT NULL
+    common_production_columns = """
+        production_id INTEGER PRIMARY KEY,
+        animal_id TEXT NOT NULL, 
+        record_date DATE NOT NULL,
+        metric_type TEXT NOT NULL, 
+        value REAL NOT NULL,
+        notes TEXT
+    """
+
+    ddl = ";\n".join(
+        [f"DROP TABLE IF EXISTS {table}" for table in table_names_to_drop]
+        + [f"CREATE TABLE {s} ({common_animal_columns})" for s in species]
+        + [f"CREATE TABLE {s[:-1]}_health_records ({common_health_columns})" for s in species]
+        + [f"CREATE TABLE {s[:-1]}_production_records ({common_production_columns})" for s in species]
+        # animal_id and record_date indexes for the agent's species JOINs and date filters
+        + [
+            f"CREATE INDEX IF NOT EXISTS idx_{s[:-1]}_{short}_{suffix} ON {s[:-1]}_{table}({col})"
+            for s in species
+            for table, short in (("health_records", "health"), ("production_records", "prod"))
+            for suffix, col in (("animal", "animal_id"), ("date", "record_date"))
+        ]
+    )
+
+    # One script for all DDL. It opens the transaction and leaves it open, so everything
+    # from the first DROP to the last INSERT is still committed together (one fsync).
     try:
-        species = ['cows', 'goats', 'sheeps', 'chickens']
-        
-        # --- NEW SPECIES-SPECIFIC CORE ANIMAL TABLES ---
-        common_animal_columns = """
-            animal_id TEXT PRIMARY KEY, 
-            name TEXT NOT NULL,
-            breed TEXT,
-            tag_id TEXT UNIQUE,
-            birth_date DATE,
-            acquisition_date DATE,
-            status TEXT NOT NULL CHECK(status IN ('Active', 'Sold', 'Deceased', 'Quarantined')),
-            sex TEXT CHECK(sex IN ('Male', 'Female', 'Unknown')),
-            weight_kg REAL,
-            last_fed_time DATETIME
-        """
-        for s in species:
-            cursor.execute(f"CREATE TABLE {s} ({common_animal_columns})")
-
-        # --- NEW SPECIES-SPECIFIC HEALTH TABLES ---
-        common_health_columns = """
-            record_id INTEGER PRIMARY KEY,
-            animal_id TEXT NOT NULL, 
-            record_date DATE NOT NULL,
-            record_type TEXT NOT NULL CHECK(record_type IN ('Vaccination', 'Treatment', 'Deworming', 'Injury', 'Symptom')),
-            description TEXT,
-            cost REAL,
-            administered_by TEXT
-        """
-        for s in species:
-            cursor.execute(f"CREATE TABLE {s[:-1]}_health_records ({common_health_columns})")
-
-        # --- NEW SPECIES-SPECIFIC PRODUCTION TABLES ---
-        # animal_id is now TEXT NOT NULL
-        common_production_columns = """
-            production_id INTEGER PRIMARY KEY,
-            animal_id TEXT NOT NULL, 
-            record_date DATE NOT NULL,
-            metric_type TEXT NOT NULL, 
-            value REAL NOT NULL,
-            notes TEXT
-        """
-        for s in species:
-            cursor.execute(f"CREATE TABLE {s[:-1]}_production_records ({common_production_columns})")
-            
+        cursor.executescript(f"BEGIN;\n{ddl};")
     except sqlite3.Error as e:
         print(f"Error setting up database: {e}")
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        conn.close()
         return
 
     # --- 3. Generate and Separate Animal Data ---
@@ -101,8 +183,10 @@ def generate_db_data():
     goats_data: List[Tuple] = []
     chickens_data: List[Tuple] = []
     sheeps_data: List[Tuple] = []
-    animal_records_map: Dict[str, str] = {} # Map ID (TEXT) -> Type (str)
-    unique_tags = set()
+    animal_data_by_type = {'cow': cows_data, 'goat': goats_data, 'chicken': chickens_data, 'sheep': sheeps_data}
+    # Parallel lists (structure of arrays): all_animal_ids[k] has species all_animal_types[k]
+    all_animal_ids: List[str] = []
+    all_animal_types: List[str] = []
     
     # Trackers for incremental ID generation (e.g., COW.1, COW.2, ...)
     type_counts = {'cow': 0, 'goat': 0, 'chicken': 0, 'sheep': 0}
@@ -118,6 +202,38 @@ def generate_db_data():
     
     quarantined_indices = random.sample(integer_ids, 5) 
 
+    # Unique tag numbers per prefix letter, drawn without replacement (COW and CHICKEN share 'C')
+    prefix_counts = Counter(t[0].upper() for t in animal_types)
+    tag_pools = {p: iter(random.sample(range(1000, 10000), n)) for p, n in prefix_counts.items()}
+
+    # Faker is slow per call, so names are drawn in one batch up front
+    names = [fake.first_name() for _ in range(NUM_ANIMALS)]
+
+    # --- Vectorized per-animal draws (one RNG call per attribute) ---
+    rng = np.random.default_rng()
+    sexes = rng.choice(['Male', 'Female'], NUM_ANIMALS).tolist()
+
+    # Birth Date Logic
+    age_groups = rng.choice(len(AGE_GROUP_PROBS), NUM_ANIMALS, p=AGE_GROUP_PROBS)
+    day_ranges = AGE_GROUP_DAY_RANGES[age_groups]
+    birth_offsets = rng.integers(day_ranges[:, 0], day_ranges[:, 1], endpoint=True)
+    birth_dates = [_DATE_CACHE[d] for d in birth_offsets.tolist()]
+    # Acquired 0-365 days after birth, worked out on the day offsets (may land after CURRENT_DATE)
+    acquisition_offsets = birth_offsets - rng.integers(0, 365, NUM_ANIMALS, endpoint=True)
+    acquisition_dates = (np.datetime64(CURRENT_DATE.date()) - acquisition_offsets.astype('timedelta64[D]')).astype(str).tolist()
+
+    # Breed and Weight Logic
+    type_array = np.array(animal_types)
+    breeds = np.empty(NUM_ANIMALS, dtype=object)
+    weights = np.empty(NUM_ANIMALS)
+    for animal_type, (breed_options, min_weight, max_weight) in SPECIES_PROFILES.items():
+        mask = type_array == animal_type
+        count = int(mask.sum())
+        breeds[mask] = rng.choice(np.array(breed_options, dtype=object), count)
+        weights[mask] = rng.uniform(min_weight, max_weight, count)
+    breeds = breeds.tolist()
+    weights = np.round(weights, 2).tolist()
+
     for i in integer_ids:
         type = animal_types[i - 1]
         type_prefix = type.upper()
@@ -127,26 +243,13 @@ def generate_db_data():
         animal_id = f"{type_prefix}.{type_counts[type]}"
         # -------------------------
 
-        name = fake.first_name()
-        sex = random.choice(['Male', 'Female'])
+        name = names[i - 1]
+        sex = sexes[i - 1]
         
         # Tag ID (still numerical based, but unique)
-        tag_id = None
-        while tag_id is None or tag_id in unique_tags:
-             tag_id = f"{type_prefix[0]}-{random.randint(1000, 9999)}"
-        unique_tags.add(tag_id)
+        tag_id = f"{type_prefix[0]}-{next(tag_pools[type_prefix[0]])}"
         
-        # Birth Date Logic
-        age_group = random.choices(['newborn', 'juvenile', 'mature', 'old'], weights=[5, 25, 60, 10], k=1)[0]
-        if age_group == 'newborn':
-            birth_date = (CURRENT_DATE - timedelta(days=random.randint(1, 30))).strftime('%Y-%m-%d')
-        elif age_group == 'juvenile':
-            birth_date = (CURRENT_DATE - timedelta(days=random.randint(31, 730))).strftime('%Y-%m-%d')
-        elif age_group == 'mature':
-            birth_date = (CURRENT_DATE - timedelta(days=random.randint(731, 1825))).strftime('%Y-%m-%d')
-        else:
-            birth_date = (CURRENT_DATE - timedelta(days=random.randint(1826, 3650))).strftime('%Y-%m-%d')
-
+        birth_date = birth_dates[i - 1]
       
         status = 'Active'
         if i > NUM_ANIMALS * 0.9: 
@@ -154,133 +257,125 @@ def generate_db_data():
         if i in quarantined_indices:
             status = 'Quarantined'
 
-        # Breed and Weight Logic
-        breed = "Local"
-        weight = random.uniform(5, 50)
-        
-        if type == 'cow':
-            breed = random.choice(['Dairy Cross', 'Boran', 'Friesian'])
-            weight = random.uniform(250, 600)
-            target_list = cows_data
-        elif type == 'goat':
-            breed = random.choice(['Boer', 'Saanen', 'Local'])
-            weight = random.uniform(30, 80)
-            target_list = goats_data
-        elif type == 'chicken':
-            breed = random.choice(['Broiler', 'Layer', 'Kienyeji'])
-            weight = random.uniform(1.5, 3.5)
-            target_list = chickens_data
-        elif type == 'sheep':
-            breed = random.choice(['Dorper', 'Red Maasai', 'Merino'])
-            weight = random.uniform(40, 90)
-            target_list = sheeps_data
-
-        acquisition_date = (datetime.strptime(birth_date, '%Y-%m-%d') + timedelta(days=random.randint(0, 365))).strftime('%Y-%m-%d')
-        last_fed_time = (CURRENT_DATE - timedelta(hours=random.randint(1, 12), minutes=random.randint(0, 59))).strftime('%Y-%m-%d %H:%M:%S')
+        acquisition_date = acquisition_dates[i - 1]
+        last_fed_time = _FED_TIME_CACHE[random.randint(1, 12) * 60 + random.randint(0, 59)]
 
         # Record the animal's type for later health/production linking
-        animal_records_map[animal_id] = type 
+        all_animal_ids.append(animal_id)
+        all_animal_types.append(type)
         
         # Data tuple for insertion
-        animal_data = (animal_id, name, breed, tag_id, birth_date, acquisition_date, status, sex, round(weight, 2), last_fed_time)
-        target_list.append(animal_data)
+        animal_data = (animal_id, name, breeds[i - 1], tag_id, birth_date, acquisition_date, status, sex, weights[i - 1], last_fed_time)
+        animal_data_by_type[type].append(animal_data)
 
     # Insert into species-specific core tables
-    common_fields = "animal_id, name, breed, tag_id, birth_date, acquisition_date, status, sex, weight_kg, last_fed_time"
-    common_placeholders = "?, ?, ?, ?, ?, ?, ?, ?, ?, ?"
+    common_fields = ("animal_id", "name", "breed", "tag_id", "birth_date", "acquisition_date", "status", "sex", "weight_kg", "last_fed_time")
     
-    cursor.executemany(f"INSERT INTO cows ({common_fields}) VALUES ({common_placeholders})", cows_data)
-    cursor.executemany(f"INSERT INTO goats ({common_fields}) VALUES ({common_placeholders})", goats_data)
-    cursor.executemany(f"INSERT INTO sheeps ({common_fields}) VALUES ({common_placeholders})", sheeps_data)
-    cursor.executemany(f"INSERT INTO chickens ({common_fields}) VALUES ({common_placeholders})", chickens_data)
+    bulk_insert(cursor, "cows", common_fields, cows_data, max_variables)
+    bulk_insert(cursor, "goats", common_fields, goats_data, max_variables)
+    bulk_insert(cursor, "sheeps", common_fields, sheeps_data, max_variables)
+    bulk_insert(cursor, "chickens", common_fields, chickens_data, max_variables)
 
 
+    # Species code of every animal, aligned with all_animal_ids
+    animal_species_codes = np.array([SPECIES_CODES[t] for t in all_animal_types])
+
     # --- 4. Health Records (Species-Specific Routing) ---
-    health_records_map: Dict[str, List[Tuple]] = {s[:-1]: [] for s in species}
     record_types = ['Vaccination', 'Treatment', 'Deworming', 'Injury', 'Symptom']
+    # record_id is left out so SQLite assigns the rowid itself (one less bind per row)
+    health_fields = ("animal_id", "record_date", "record_type", "description", "cost", "administered_by")
     
-    # We now iterate over the TEXT animal IDs
-    all_animal_ids = list(animal_records_map.keys())
+    # One batched draw picks the animal for every record; records are then grouped by species
+    health_idx = rng.integers(0, NUM_ANIMALS, NUM_HEALTH_RECORDS)
+    health_ids = [all_animal_ids[k] for k in health_idx]
+    health_partitions = partition_by_species(animal_species_codes[health_idx])
+
+    # Every other per-record random value is also drawn up front and indexed by record position
+    health_day_offsets = rng.integers(1, 730, NUM_HEALTH_RECORDS, endpoint=True)
+    health_day_offsets[:10] = rng.integers(0, 1, min(10, NUM_HEALTH_RECORDS), endpoint=True)
+    health_dates = [_DATE_CACHE[d] for d in health_day_offsets.tolist()]
+    health_types = random.choices(record_types, weights=[55, 25, 10, 5, 5], k=NUM_HEALTH_RECORDS)
+    health_costs = np.round(rng.uniform(50, 5000, NUM_HEALTH_RECORDS), 2).tolist()
+    health_admins = random.choices(['Vet', 'Farm Hand', 'Self'], k=NUM_HEALTH_RECORDS)
     
-    for i in range(NUM_HEALTH_RECORDS):
-        animal_id = random.choice(all_animal_ids)
-        animal_type = animal_records_map[animal_id]
-        
-        if i < 10: 
-             record_date = (CURRENT_DATE - timedelta(days=random.randint(0, 1))).strftime('%Y-%m-%d')
-        else:
-            record_date = (CURRENT_DATE - timedelta(days=random.randint(1, 730))).strftime('%Y-%m-%d')
-        
-        record_type = random.choices(record_types, weights=[55, 25, 10, 5, 5], k=1)[0]
-        
-        description = f"{record_type} event: {fake.text(max_nb_chars=50)}"
-        if record_type == 'Vaccination':
-             description = random.choice(['FMD vaccine administered', 'Blackquarter dose', 'Peste des Petits Ruminants (PPR) vaccine'])
-        elif record_type == 'Treatment':
-             description = random.choice(['Antibiotics for mastitis', 'Acaricide dip for ticks', 'Fluid therapy'])
-        elif record_type == 'Symptom':
-             description = random.choice(['Sudden drop in feed intake', 'Lethargy and fever', 'Diarrhea'])
-        elif record_type == 'Injury':
-             description = random.choice(['Deep laceration on leg', 'Broken horn', 'Eye infection'])
-
-        cost = round(random.uniform(50, 5000), 2)
-        administered_by = random.choice(['Vet', 'Farm Hand', 'Self'])
-        
-        # Route to the correct species-specific list
-        health_records_map[animal_type].append((None, animal_id, record_date, record_type, description, cost, administered_by))
+    health_chunk_rows = max_variables // len(health_fields)
+    for animal_type, positions in zip(SPECIES_ORDER, health_partitions):
+        table_name = HEALTH_TABLE[animal_type]
+        # Rows are built and inserted one statement-sized chunk at a time, never the whole table
+        for start in range(0, len(positions), health_chunk_rows):
+            chunk = positions[start:start + health_chunk_rows]
+            data_list: List[Tuple] = [None] * len(chunk)
+            for slot, i in enumerate(chunk.tolist()):
+                animal_id = health_ids[i]
+                record_date = health_dates[i]
+                record_type = health_types[i]
+            
+                if record_type in HEALTH_DESCRIPTIONS:
+                    description = random.choice(HEALTH_DESCRIPTIONS[record_type])
+                else:
+                    description = f"{record_type} event: {fake.text(max_nb_chars=50)}"
+
+                data_list[slot] = (animal_id, record_date, record_type, description, health_costs[i], health_admins[i])
 
-    # Insert into species-specific health tables
-    health_fields = "record_id, animal_id, record_date, record_type, description, cost, administered_by"
-    health_placeholders = "?, ?, ?, ?, ?, ?, ?"
-    for species_type, data_list in health_records_map.items():
-        table_name = get_table_name(species_type, 'health')
-        cursor.executemany(f"INSERT INTO {table_name} ({health_fields}) VALUES ({health_placeholders})", data_list)
+            bulk_insert(cursor, table_name, health_fields, data_list, max_variables)
 
 
     # --- 5. Production Records (Species-Specific Routing) ---
-    production_records_map: Dict[str, List[Tuple]] = {s[:-1]: [] for s in species}
     prod_metrics = ['Milk Yield (L)', 'Weight Gain (kg)', 'Egg Count', 'Wool Yield (kg)']
+    production_fields = ("animal_id", "record_date", "metric_type", "value", "notes")
+    production_notes = [fake.text(max_nb_chars=30) for _ in range(NUM_PRODUCTION_RECORDS)]
+    
+    production_idx = rng.integers(0, NUM_ANIMALS, NUM_PRODUCTION_RECORDS)
+    production_ids = [all_animal_ids[k] for k in production_idx]
+    production_partitions = partition_by_species(animal_species_codes[production_idx])
+
+    production_dates = [_DATE_CACHE[d] for d in rng.integers(1, 180, NUM_PRODUCTION_RECORDS, endpoint=True).tolist()]
+    metric_rolls = rng.random(NUM_PRODUCTION_RECORDS).tolist()
+    value_rolls = rng.random(NUM_PRODUCTION_RECORDS).tolist()
+    zero_rolls = (rng.random(NUM_PRODUCTION_RECORDS) < 0.02).tolist()
     
-    for i in range(NUM_PRODUCTION_RECORDS):
-        animal_id = random.choice(all_animal_ids)
-        record_date = (CURRENT_DATE - timedelta(days=random.randint(1, 180))).strftime('%Y-%m-%d')
-        animal_type = animal_records_map[animal_id]
-
-        # Determine the most relevant metric based on animal type
-        metric_type = ""
-        if animal_type in ['cow', 'goat']:
-            metric_type = 'Milk Yield (L)' if random.random() < 0.7 else 'Weight Gain (kg)'
-        elif animal_type == 'chicken':
-            metric_type = 'Egg Count' if random.random() < 0.8 else 'Weight Gain (kg)'
-        elif animal_type == 'sheep':
-            metric_type = 'Wool Yield (kg)' if random.random() < 0.6 else 'Weight Gain (kg)'
-
-        value = 0.0
-        if metric_type == 'Milk Yield (L)':
-            value = random.uniform(5.0, 30.0)
-        elif metric_type == 'Weight Gain (kg)':
-            value = random.uniform(0.1, 5.0)
-        elif metric_type == 'Egg Count':
-            value = random.randint(1, 7)
-        elif metric_type == 'Wool Yield (kg)':
-            value = random.uniform(1.0, 8.0)
+    production_chunk_rows = max_variables // len(production_fields)
+    for animal_type, positions in zip(SPECIES_ORDER, production_partitions):
+        table_name = PROD_TABLE[animal_type]
+        for start in range(0, len(positions), production_chunk_rows):
+            chunk = positions[start:start + production_chunk_rows]
+            data_list = [None] * len(chunk)
+            for slot, i in enumerate(chunk.tolist()):
+                animal_id = production_ids[i]
+                record_date = production_dates[i]
+                metric_roll = metric_rolls[i]
+                u = value_rolls[i]
+
+                # Determine the most relevant metric based on animal type
+                metric_type = ""
+                if animal_type in ['cow', 'goat']:
+                    metric_type = 'Milk Yield (L)' if metric_roll < 0.7 else 'Weight Gain (kg)'
+                elif animal_type == 'chicken':
+                    metric_type = 'Egg Count' if metric_roll < 0.8 else 'Weight Gain (kg)'
+                elif animal_type == 'sheep':
+                    metric_type = 'Wool Yield (kg)' if metric_roll < 0.6 else 'Weight Gain (kg)'
+
+                # Scale the pre-drawn uniform [0, 1) roll into each metric's range
+                value = 0.0
+                if metric_type == 'Milk Yield (L)':
+                    value = 5.0 + 25.0 * u
+                elif metric_type == 'Weight Gain (kg)':
+                    value = 0.1 + 4.9 * u
+                elif metric_type == 'Egg Count':
+                    value = 1 + int(u * 7)
+                elif metric_type == 'Wool Yield (kg)':
+                    value = 1.0 + 7.0 * u
+                
+                if zero_rolls[i]:
+                    value = 0.0
+
+                notes = production_notes[i]
             
-        if random.random() < 0.02:
-            value = 0.0
+                data_list[slot] = (animal_id, record_date, metric_type, round(value, 2), notes)
 
-        notes = fake.text(max_nb_chars=30)
-        
-        # Route to the correct species-specific list
-        production_records_map[animal_type].append((None, animal_id, record_date, metric_type, round(value, 2), notes))
-
-    # Insert into species-specific production tables
-    production_fields = "production_id, animal_id, record_date, metric_type, value, notes"
-    production_placeholders = "?, ?, ?, ?, ?, ?"
-    for species_type, data_list in production_records_map.items():
-        table_name = get_table_name(species_type, 'production')
-        cursor.executemany(f"INSERT INTO {table_name} ({production_fields}) VALUES ({production_placeholders})", data_list)
+            bulk_insert(cursor, table_name, production_fields, data_list, max_variables)
     
-    conn.commit()
+    cursor.execute("COMMIT")
     conn.close()
     
     total_records = NUM_HEALTH_RECORDS + NUM_PRODUCTION_RECORDS
@@ -6,12 +6,32 @@ from state import AgentState
 # -----------------------
 # Logging Configuration
 # -----------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-)
+# Only configure the root logger if the host application hasn't already done so
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    )
 logger = logging.getLogger("AgriWealthMain")
 
+# Clean per-turn state; each turn copies it and overrides question/mode.
+# Nodes reassign fields rather than mutating them in place, so a shallow copy is enough.
+_TEMPLATE_STATE: Dict[str, Any] = dict(AgentState(
+    question="",
+    mode="",
+    db_entry="",
+    sql_query=[],
+    query_result="",
+    query_rows={},
+    attempts=0,
+    relevance="",
+    sql_error=False,
+    animal_type="unknown",
+    intent="",
+    answer_template="",
+    is_simple_listing=False
+))
+
 # -----------------------
 # High-level query processor
 # -----------------------
@@ -23,19 +43,9 @@ def process_livestock_query(question: str, current_mode: Optional[str] = None) -
     """
     try:
         # FIX: Always initialize a CLEAN state for the new turn.
-        state = AgentState(
-            question=question,
-            mode=current_mode, # Pass the mode directly
-            db_entry="",
-            sql_query=[],
-            query_result="",
-            query_rows={},
-            attempts=0,
-            relevance="",
-            sql_error=False,
-            animal_type="unknown",
-            intent=""
-        )
+        state = _TEMPLATE_STATE.copy()
+        state["question"] = question
+        state["mode"] = current_mode # Pass the mode directly
 
         # Run workflow
         final_state = app.invoke(state) 
@@ -65,10 +75,31 @@ def process_livestock_query(question: str, current_mode: Optional[str] = None) -
         }
 
 
+def warm_up_workflow() -> None:
+    """
+    Runs one throwaway invocation so the first real query skips LangGraph's one-off
+    first-invoke setup (a few milliseconds; the graph itself is compiled at import).
+    An empty mode routes straight to invalid_mode_handler, so no LLM or database call is made.
+    """
+    try:
+        state = _TEMPLATE_STATE.copy()
+        state["question"] = "__warmup__"
+        # The invalid-mode route logs a warning; the warm-up should not show up in the logs
+        logging.disable(logging.WARNING)
+        try:
+            app.invoke(state)
+        finally:
+            logging.disable(logging.NOTSET)
+    except Exception as e:
+        logger.warning(f"Workflow warm-up failed: {e}")
+
+
 # -----------------------
 # CLI Interface for Testing
 # -----------------------
 def main():
+    warm_up_workflow()
+
     print("Welcome to AgriWealth Livestock Assistant! (Conversational Mode)")
     print("Type 'exit' or 'quit' to end the session.")
     
@@ -20,6 +20,8 @@ class AgentState(TypedDict):
     sql_error: bool        # Flag indicating if any SQL query failed execution
     animal_type: str       # Detected species (e.g., 'cow', 'goat')
     intent: str            # Detected action intent (e.g., 'query_db')
+    answer_template: str   # Planner's draft Markdown answer with {query_N} placeholders ('' = needs full synthesis)
+    is_simple_listing: bool # Planner judged the answer a plain record listing that can be shown as a table
 
 # =============================================================
 # STRUCTURED OUTPUT MODELS (Pydantic)
@@ -30,6 +32,25 @@ class ConvertToSQL(BaseModel):
         description="A list of 1 to 5 optimized SQL SELECT queries required to answer the user's question completely."
     )
 
+class ConvertAndSynthesize(ConvertToSQL):
+    """Structured output for the SQL Planner agent, batched with a draft answer."""
+    draft_answer_template: str = Field(
+        default="",
+        description=(
+            "For SIMPLE lookup questions only: a short Markdown answer using {query_1} ... {query_5} "
+            "as placeholders where the rows of each query are inserted. Leave EMPTY when the answer "
+            "needs calculations, comparisons, age/life-stage reasoning or advice."
+        )
+    )
+    is_simple_listing: bool = Field(
+        default=False,
+        description=(
+            "True ONLY when the question just asks to list or show stored records and the raw rows "
+            "are the complete answer. False when the answer needs calculations, comparisons, "
+            "age/life-stage reasoning or advice."
+        )
+    )
+
 class RewrittenQuestion(BaseModel):
     """Structured output for the Query Recovery agent."""
     question: str = Field(